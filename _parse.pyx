@@ -0,0 +1,99 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+ASCII number parsers for the byte-level csv aggregation path.
+
+Build in place with ``cythonize -i _parse.pyx``. aggregator.py falls back to
+int()/float() on decoded text when this module is not compiled.
+
+Both parsers accept exactly what int() / float() accept: plain fields take
+the fast path, anything else (underscores, non-ASCII digits, text strtod
+reads differently such as hex) is handed to the builtin, which also raises
+the same ValueError the csv path would.
+"""
+
+from cpython.float cimport PyFloat_FromString
+from libc.stdlib cimport strtod
+
+
+cdef inline bint _is_space(unsigned char c):
+    # ASCII whitespace as stripped by int() / float()
+    return c == 32 or 9 <= c <= 13
+
+
+cpdef long long parse_i64(bytes text) except? -1:
+    """
+    Parse an optionally signed integer field.
+
+    Walks the digits directly instead of going through int()'s generic
+    Unicode-aware parser; surrounding ASCII whitespace is skipped.
+
+    Raises:
+        ValueError: If int() rejects the field.
+    """
+    cdef const unsigned char* s = text
+    cdef Py_ssize_t n = len(text)
+    cdef Py_ssize_t i = 0
+    cdef long long value = 0
+    cdef bint negative = False
+
+    while i < n and _is_space(s[i]):
+        i += 1
+    while n > i and _is_space(s[n - 1]):
+        n -= 1
+
+    if i < n and (s[i] == 45 or s[i] == 43):  # '-' / '+'
+        negative = s[i] == 45
+        i += 1
+    # 18 digits always fit in a signed 64-bit integer
+    if i == n or n - i > 18:
+        return int(text)
+
+    while i < n:
+        if s[i] < 48 or s[i] > 57:
+            return int(text)
+        value = value * 10 + (s[i] - 48)
+        i += 1
+    return -value if negative else value
+
+
+cdef double _builtin_float(bytes text) except? -1.0:
+    # Call CPython's float() parser; Cython's inlined float() on bytes
+    # accepts some misplaced underscores that float() rejects
+    return PyFloat_FromString(text)
+
+
+cpdef double parse_f64(bytes text) except? -1.0:
+    """
+    Parse a decimal field with the C library's strtod.
+
+    Only fields made of digits, sign, '.' and exponent characters (plus
+    surrounding ASCII whitespace) reach strtod.
+
+    Raises:
+        ValueError: If float() rejects the field.
+    """
+    cdef const unsigned char* s = text
+    cdef Py_ssize_t n = len(text)
+    cdef Py_ssize_t i = 0
+    cdef Py_ssize_t j
+    cdef char* end
+    cdef double value
+    cdef unsigned char c
+
+    while i < n and _is_space(s[i]):
+        i += 1
+    while n > i and _is_space(s[n - 1]):
+        n -= 1
+    if i == n:
+        return _builtin_float(text)
+
+    for j in range(i, n):
+        c = s[j]
+        if not (48 <= c <= 57 or c == 46 or c == 43 or c == 45 or c == 101 or c == 69):
+            return _builtin_float(text)
+
+    # bytes objects are always NUL-terminated, so strtod cannot overrun
+    value = strtod(<const char*>s + i, &end)
+    if <const char*>end != <const char*>s + n:
+        return _builtin_float(text)
+    return value
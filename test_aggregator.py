@@ -3,9 +3,11 @@ Test suite for AdAggregator class.
 Uses pytest fixtures to create temporary CSV test data.
 """
 
+import csv
 import os
 import pytest
 import tempfile
+import aggregator as aggregator_module
 from aggregator import AdAggregator
 
 
@@ -17,6 +19,35 @@ CMP019,2025-02-05,7214,236,135.93,21
 """
 
 
+# Aggregation engines in the order AdAggregator tries them: the module each
+# one needs, and the module attributes to null so earlier engines are skipped
+ENGINES = {
+    'polars': ('polars', ()),
+    'pyarrow': ('pyarrow', ('pl',)),
+    'pandas': ('pandas', ('pl', 'pa')),
+    'numba': ('numba', ('pl', 'pa', 'pd')),
+    'csv': (None, ('pl', 'pa', 'pd', '_scan_campaign_bytes')),
+}
+
+
+@pytest.fixture(params=list(ENGINES))
+def engine(request, monkeypatch):
+    """
+    Force one aggregation engine by disabling the engines tried before it.
+    
+    Yields:
+        str: Name of the engine under test.
+    """
+    module, disabled = ENGINES[request.param]
+    if module is not None:
+        pytest.importorskip(module)
+    if request.param == 'numba' and aggregator_module._scan_campaign_bytes is None:
+        pytest.skip("Numba scanner needs NumPy")
+    for name in disabled:
+        monkeypatch.setattr(aggregator_module, name, None)
+    yield request.param
+
+
 @pytest.fixture
 def temp_csv_file():
     """
@@ -37,11 +68,12 @@ def temp_csv_file():
 
 
 @pytest.fixture
-def aggregator_with_data(temp_csv_file):
+def aggregator_with_data(engine, temp_csv_file):
     """
     Create an AdAggregator instance with sample data loaded.
     
     Args:
+        engine: Fixture selecting the aggregation engine.
         temp_csv_file: Fixture providing the temp CSV path.
         
     Returns:
@@ -147,10 +179,181 @@ class TestIntegration:
             
             assert os.path.exists(ctr_path), "top10_ctr.csv should be created"
             assert os.path.exists(cpa_path), "top10_cpa.csv should be created"
+    
+    def test_reports_keep_only_top_10_in_order(self, tmp_path):
+        """Verify reports hold the 10 best campaigns, sorted by the ranking metric."""
+        lines = ["campaign_id,date,impressions,clicks,spend,conversions"]
+        for i in range(15):
+            # CTR and CPA both rise with i; CMP014 has no conversions
+            conversions = 0 if i == 14 else 15 - i
+            lines.append(f"CMP{i:03d},2025-01-01,1000,{i + 1},100.00,{conversions}")
+        input_path = tmp_path / "many.csv"
+        input_path.write_text("\n".join(lines) + "\n", encoding='utf-8')
+        
+        aggregator = AdAggregator()
+        aggregator.aggregate(str(input_path))
+        aggregator.write_reports(str(tmp_path))
+        
+        with open(tmp_path / 'top10_ctr.csv', newline='', encoding='utf-8') as f:
+            ctr_ids = [row['campaign_id'] for row in csv.DictReader(f)]
+        with open(tmp_path / 'top10_cpa.csv', newline='', encoding='utf-8') as f:
+            cpa_ids = [row['campaign_id'] for row in csv.DictReader(f)]
+        
+        assert ctr_ids == [f"CMP{i:03d}" for i in range(14, 4, -1)]
+        assert cpa_ids == [f"CMP{i:03d}" for i in range(10)]
+    
+    @pytest.mark.usefixtures('engine')
+    def test_reports_break_ties_by_first_seen_order(self, tmp_path):
+        """Verify campaigns tied on CTR/CPA are ranked in the order they first appear."""
+        lines = ["campaign_id,date,impressions,clicks,spend,conversions"]
+        for i in range(25):
+            # All campaigns tie on CTR 0.05 and CPA 10 except CMP017, which ranks first
+            clicks, conversions = (60, 6) if i == 7 else (50, 5)
+            lines.append(f"CMP{24 - i:03d},2025-01-01,1000,{clicks},50.00,{conversions}")
+        input_path = tmp_path / "ties.csv"
+        input_path.write_text("\n".join(lines) + "\n", encoding='utf-8')
+        
+        aggregator = AdAggregator()
+        aggregator.aggregate(str(input_path))
+        aggregator.write_reports(str(tmp_path))
+        
+        with open(tmp_path / 'top10_ctr.csv', newline='', encoding='utf-8') as f:
+            ctr_ids = [row['campaign_id'] for row in csv.DictReader(f)]
+        with open(tmp_path / 'top10_cpa.csv', newline='', encoding='utf-8') as f:
+            cpa_ids = [row['campaign_id'] for row in csv.DictReader(f)]
+        
+        expected = ["CMP017"] + [f"CMP{24 - i:03d}" for i in range(10) if i != 7]
+        assert ctr_ids == expected
+        assert cpa_ids == expected
+    
+    def test_scan_defers_reading_until_results_are_needed(self, tmp_path):
+        """Verify scan() does not touch the file before a result is requested."""
+        input_path = tmp_path / "late.csv"
+        aggregator = AdAggregator().scan(str(input_path))
+        
+        # The file only exists after scan(); reading must happen lazily
+        input_path.write_text(SAMPLE_DATA, encoding='utf-8')
+        aggregator.write_reports(str(tmp_path))
+        
+        assert aggregator.get_campaign_total('CMP025')['impressions'] == 3653
+        assert os.path.exists(tmp_path / 'top10_ctr.csv')
+        assert os.path.exists(tmp_path / 'top10_cpa.csv')
+    
+    def test_top_ctr_query_writes_only_ctr_columns(self, temp_csv_file, tmp_path):
+        """Verify the lazy top_ctr() query ranks by CTR and writes its own columns."""
+        query = AdAggregator(temp_csv_file).top_ctr(2)
+        output_path = tmp_path / 'ctr_only.csv'
+        query.to_csv(str(output_path))
+        
+        with open(output_path, newline='', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        
+        assert [row['campaign_id'] for row in rows] == ['CMP019', 'CMP020']
+        assert list(rows[0]) == ['campaign_id', 'total_impressions', 'total_clicks', 'CTR']
+        assert rows[0]['CTR'] == f"{236 / 7214:.4f}"
+    
+    def test_compiled_parsers_match_builtins(self):
+        """Verify the Cython field parsers agree with int() and float()."""
+        parse = pytest.importorskip('_parse')
+        
+        assert parse.parse_i64(b'3653') == 3653
+        assert parse.parse_i64(b'-42') == -42
+        assert parse.parse_f64(b'1394.62') == float('1394.62')
+        with pytest.raises(ValueError):
+            parse.parse_i64(b'12a')
+        with pytest.raises(ValueError):
+            parse.parse_f64(b'')
+        
+        # Fields outside the fast path defer to int() / float()
+        assert parse.parse_i64(b' 10 ') == 10
+        assert parse.parse_i64(b'1_000') == 1000
+        assert parse.parse_i64(b'1234567890123456789') == 1234567890123456789
+        assert parse.parse_f64(b'2.5\t') == 2.5
+        assert parse.parse_f64(b'1e3') == 1000.0
+        with pytest.raises(ValueError):
+            parse.parse_i64(b'0x10')
+        with pytest.raises(ValueError):
+            parse.parse_f64(b'0x10')
+    
+    @pytest.mark.parametrize('compiled', [False, True])
+    def test_sum_lines_matches_csv_parsing(self, monkeypatch, compiled):
+        """Verify _sum_lines accepts and rejects the same fields as the csv path."""
+        if compiled:
+            parse = pytest.importorskip('_parse')
+            parse_i64, parse_f64 = parse.parse_i64, parse.parse_f64
+        else:
+            parse_i64, parse_f64 = int, float
+        monkeypatch.setattr(aggregator_module, 'parse_i64', parse_i64)
+        monkeypatch.setattr(aggregator_module, 'parse_f64', parse_f64)
+        indices = (0, 2, 3, 4, 5)
+        
+        totals = aggregator_module._sum_lines([
+            b'CMP001,2025-01-01,10 ,1, 2.50,1\n',
+            b'CMP001,2025-01-02,1_000,0,0.5,0\r\n',
+            b'"CMP,002",2025-01-01,5,1,1.0,1\n',
+            b'"CMP\n',
+            b'003",2025-01-01,2,0,1.0,0\n',
+            b'\n',
+        ], *indices)
+        
+        assert totals == {
+            'CMP001': [1010, 1, 3.0, 1],
+            'CMP,002': [5, 1, 1.0, 1],
+            'CMP\n003': [2, 0, 1.0, 0],
+        }
+        with pytest.raises(ValueError):
+            aggregator_module._sum_lines([b'CMP001,2025-01-01,0x10,1,2.5,1\n'], *indices)
+        with pytest.raises(ValueError):
+            aggregator_module._sum_lines([b'CMP001,2025-01-01,10,1,0x10,1\n'], *indices)
+    
+    def test_parallel_aggregation_matches_sequential(self, tmp_path, monkeypatch):
+        """Verify splitting the file across workers gives the same totals."""
+        lines = ["campaign_id,date,impressions,clicks,spend,conversions"]
+        for i in range(200):
+            lines.append(f"CMP{i % 7:03d},2025-01-01,{100 + i},{i % 13},{i}.25,{i % 3}")
+        input_path = tmp_path / "chunks.csv"
+        input_path.write_text("\n".join(lines) + "\n", encoding='utf-8')
+        
+        sequential = AdAggregator(workers=1).aggregate(str(input_path))
+        
+        monkeypatch.setattr(aggregator_module, 'pl', None)
+        monkeypatch.setattr(aggregator_module, 'pa', None)
+        monkeypatch.setattr(aggregator_module, 'pd', None)
+        monkeypatch.setattr(aggregator_module, '_scan_campaign_bytes', None)
+        monkeypatch.setattr(aggregator_module, '_PARALLEL_MIN_BYTES', 0)
+        parallel = AdAggregator(workers=3).aggregate(str(input_path))
+        
+        assert parallel.keys() == sequential.keys()
+        for campaign_id, totals in sequential.items():
+            assert parallel[campaign_id]['impressions'] == totals['impressions']
+            assert parallel[campaign_id]['clicks'] == totals['clicks']
+            assert parallel[campaign_id]['conversions'] == totals['conversions']
+            assert abs(parallel[campaign_id]['spend'] - totals['spend']) < 1e-6
+    
+    def test_parallel_aggregation_keeps_multiline_quoted_fields(self, tmp_path, monkeypatch):
+        """Verify a quoted field spanning lines is not split between workers."""
+        input_path = tmp_path / "quoted.csv"
+        input_path.write_text(
+            "campaign_id,date,impressions,clicks,spend,conversions\n"
+            "CMP001,2025-01-01,10,1,2.50,1\n"
+            '"CMP\n\n\n\n\n\n002",2025-01-01,5,1,1.00,1\n',
+            encoding='utf-8'
+        )
+        
+        monkeypatch.setattr(aggregator_module, 'pl', None)
+        monkeypatch.setattr(aggregator_module, 'pa', None)
+        monkeypatch.setattr(aggregator_module, 'pd', None)
+        monkeypatch.setattr(aggregator_module, '_scan_campaign_bytes', None)
+        monkeypatch.setattr(aggregator_module, '_PARALLEL_MIN_BYTES', 0)
+        results = AdAggregator(workers=2).aggregate(str(input_path))
+        
+        assert list(results) == ['CMP001', 'CMP\n\n\n\n\n\n002']
+        assert results['CMP\n\n\n\n\n\n002']['impressions'] == 5
 
 
+@pytest.mark.usefixtures('engine')
 class TestEdgeCases:
-    """Tests for edge case handling."""
+    """Tests for edge case handling, run against every installed engine."""
     
     def test_zero_conversions_cpa_is_none(self):
         """Verify CPA is None when conversions = 0."""
@@ -171,6 +374,51 @@ CMP_ZERO,2025-01-01,1000,50,100.00,0
         finally:
             os.unlink(temp_path)
     
+    def test_blank_lines_are_skipped(self, tmp_path):
+        """Verify blank lines in the input do not break aggregation."""
+        input_path = tmp_path / "blank.csv"
+        input_path.write_text(SAMPLE_DATA + "\n" + SAMPLE_DATA.splitlines()[1] + "\n\n", encoding='utf-8')
+        
+        aggregator = AdAggregator()
+        aggregator.aggregate(str(input_path))
+        
+        assert aggregator.get_campaign_total('CMP025')['impressions'] == 2 * 3653
+        assert None not in aggregator.get_results()
+    
+    def test_empty_campaign_id_is_kept(self, tmp_path):
+        """Verify a row with an empty campaign_id is aggregated under ''."""
+        input_path = tmp_path / "empty_id.csv"
+        input_path.write_text(
+            "campaign_id,date,impressions,clicks,spend,conversions\n"
+            ",2025-01-01,3,1,1.00,1\n"
+            "CMP001,2025-01-01,1000,50,100.00,5\n",
+            encoding='utf-8'
+        )
+        
+        results = AdAggregator().aggregate(str(input_path))
+        
+        assert list(results) == ['', 'CMP001']
+        assert results['']['impressions'] == 3
+        assert AdAggregator().scan(str(input_path)).top_ctr().rows()[0]['campaign_id'] == ''
+    
+    @pytest.mark.parametrize('row', [
+        "CMP001,2025-01-01,,50,100.00,5",
+        "CMP001,2025-01-01,1000,50,100.00",
+    ], ids=['empty-field', 'short-row'])
+    def test_missing_metric_values_are_rejected(self, tmp_path, row):
+        """Verify an empty or missing metric field raises instead of summing as 0."""
+        input_path = tmp_path / "missing.csv"
+        input_path.write_text(
+            "campaign_id,date,impressions,clicks,spend,conversions\n"
+            "CMP002,2025-01-01,1000,50,100.00,5\n" + row + "\n",
+            encoding='utf-8'
+        )
+        
+        with pytest.raises((ValueError, IndexError)):
+            AdAggregator().aggregate(str(input_path))
+        with pytest.raises((ValueError, IndexError)):
+            AdAggregator().scan(str(input_path)).write_reports(str(tmp_path / "out"))
+    
     def test_zero_impressions_ctr_is_zero(self):
         """Verify CTR is 0 when impressions = 0."""
         # Create test data with zero impressions
@@ -189,6 +437,109 @@ CMP_ZERO,2025-01-01,0,0,100.00,5
             assert metrics['CMP_ZERO']['ctr'] == 0.0
         finally:
             os.unlink(temp_path)
+    
+    def test_report_formats_metrics_with_four_decimals(self, tmp_path):
+        """Verify report floats use 4 decimals and a missing CPA is left empty."""
+        input_path = tmp_path / "format.csv"
+        input_path.write_text(
+            "campaign_id,date,impressions,clicks,spend,conversions\n"
+            "CMP_ZERO,2025-01-01,1000,50,100.5,0\n",
+            encoding='utf-8'
+        )
+        
+        aggregator = AdAggregator()
+        aggregator.aggregate(str(input_path))
+        aggregator.write_reports(str(tmp_path))
+        
+        with open(tmp_path / 'top10_ctr.csv', newline='', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        
+        assert rows == [{
+            'campaign_id': 'CMP_ZERO',
+            'total_impressions': '1000',
+            'total_clicks': '50',
+            'total_spend': '100.5000',
+            'total_conversions': '0',
+            'CTR': '0.0500',
+            'CPA': ''
+        }]
+
+    
+    @pytest.mark.parametrize('content', ["", "campaign_id,date,impressions,clicks,spend,conversions\n"])
+    def test_empty_file_has_no_campaigns(self, tmp_path, content):
+        """Verify an empty or header-only file yields no campaigns and no reports."""
+        input_path = tmp_path / "empty.csv"
+        input_path.write_text(content, encoding='utf-8')
+        output_dir = tmp_path / "out"
+        
+        assert AdAggregator().aggregate(str(input_path)) == {}
+        assert AdAggregator().scan(str(input_path)).top_ctr().rows() == []
+        
+        AdAggregator().scan(str(input_path)).write_reports(str(output_dir))
+        assert os.listdir(output_dir) == []
+    
+    def test_quoted_campaign_ids(self, tmp_path):
+        """Verify quoted campaign_id fields, including embedded commas, are unquoted."""
+        input_path = tmp_path / "quoted.csv"
+        input_path.write_text(
+            "campaign_id,date,impressions,clicks,spend,conversions\n"
+            '"CMP,001",2025-01-01,1000,50,100.00,5\n'
+            '"CMP002",2025-01-01,2000,10,30.00,1\n'
+            'CMP002,2025-01-02,500,5,20.00,1\n',
+            encoding='utf-8'
+        )
+        
+        results = AdAggregator().aggregate(str(input_path))
+        
+        assert results['CMP,001']['impressions'] == 1000
+        assert results['CMP002']['impressions'] == 2500
+        assert results['CMP002']['conversions'] == 2
+    
+    def test_long_campaign_ids(self, tmp_path):
+        """Verify ids longer than 8 bytes (beyond the Numba scanner's key) aggregate correctly."""
+        input_path = tmp_path / "long_ids.csv"
+        input_path.write_text(
+            "campaign_id,date,impressions,clicks,spend,conversions\n"
+            "CAMPAIGN_0001,2025-01-01,1000,50,100.00,5\n"
+            "CAMPAIGN_0002,2025-01-01,2000,10,30.00,1\n"
+            "CAMPAIGN_0001,2025-01-02,500,5,20.00,1\n",
+            encoding='utf-8'
+        )
+        
+        results = AdAggregator().aggregate(str(input_path))
+        
+        assert list(results) == ['CAMPAIGN_0001', 'CAMPAIGN_0002']
+        assert results['CAMPAIGN_0001']['impressions'] == 1500
+        assert results['CAMPAIGN_0001']['conversions'] == 6
+    
+    def test_many_campaigns(self, tmp_path, monkeypatch, engine):
+        """Verify totals stay correct past the Numba scanner's initial table size."""
+        count = 3000
+        lines = ["campaign_id,date,impressions,clicks,spend,conversions"]
+        for i in range(2 * count):
+            lines.append(f"C{i % count},2025-01-01,{i},1,0.50,1")
+        input_path = tmp_path / "many_ids.csv"
+        input_path.write_text("\n".join(lines) + "\n", encoding='utf-8')
+        
+        capacities = []
+        if engine == 'numba':
+            scan = aggregator_module._scan_campaign_bytes
+            
+            def recording_scan(*args):
+                capacities.append(args[-1])
+                return scan(*args)
+            
+            monkeypatch.setattr(aggregator_module, '_scan_campaign_bytes', recording_scan)
+        
+        results = AdAggregator().aggregate(str(input_path))
+        
+        assert len(results) == count
+        assert results['C7'] == {
+            'impressions': 7 + (count + 7), 'clicks': 2, 'spend': 1.0, 'conversions': 2
+        }
+        if engine == 'numba':
+            # The first table is too small for 3000 ids and must be regrown
+            assert len(capacities) > 1 and 2 * count <= capacities[-1]
 
 
 if __name__ == "__main__":